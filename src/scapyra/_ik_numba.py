@@ -0,0 +1,86 @@
+"""
+Compiled inverse kinematics for SCARAController._solve_path().
+
+Needs the optional numba dependency. Importing this module raises
+ImportError without it, and the controller then uses its NumPy implementation.
+"""
+import hashlib
+import inspect
+from typing import Tuple
+
+import numpy as np
+from numba import njit
+from numba.extending import register_jitable
+
+from . import geometry
+
+# Compile the scalar IK from geometry as-is, so the kernel below runs the very
+# same formula as flat_move() instead of a hand-synced copy.
+_solve_arm_angle = register_jitable(geometry._solve_arm_angle)
+
+# numba validates its on-disk cache against this file only, while the kernel
+# also compiles in geometry._solve_arm_angle. The cache is therefore used only
+# while that function's source matches this digest; after editing it, update
+# the digest (test_numba_kernel_digest_is_current shows the new value), which
+# also changes this file and so invalidates the stale cache entries.
+_GEOMETRY_DIGEST = "a594faa701d81f6d9aa5bbfa1a7baf15c837996de3fd04e69bc5e1b3083e32bd"
+
+
+def _geometry_digest() -> str:
+    """ SHA-256 of the geometry source compiled into solve_path() """
+    try:
+        source = inspect.getsource(geometry._solve_arm_angle)
+    except OSError:
+        return ""
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+@njit(cache=bool(_GEOMETRY_DIGEST) and _geometry_digest() == _GEOMETRY_DIGEST)
+def solve_path(
+    x_values: np.ndarray,
+    y_values: np.ndarray,
+    x1: float,
+    y1: float,
+    x2: float,
+    y2: float,
+    arm: float,
+    forearm: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Inverse kinematics and workspace constraints for every TCP position
+    in a single compiled loop.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        Angles of motor1 and motor2 in degrees and a boolean mask
+        of positions that flat_move() would accept.
+    """
+    n = x_values.shape[0]
+    angles1 = np.zeros(n)
+    angles2 = np.zeros(n)
+    valid = np.zeros(n, dtype=np.bool_)
+    arm_sq = arm**2
+    rdiff = arm_sq - forearm**2
+
+    for i in range(n):
+        x = x_values[i]
+        y = y_values[i]
+        if y < 0:
+            continue
+
+        solution1 = _solve_arm_angle(x1, y1, x, y, arm, forearm, arm_sq, rdiff, True)
+        if solution1 is None:
+            continue
+        solution2 = _solve_arm_angle(x2, y2, x, y, arm, forearm, arm_sq, rdiff, False)
+        if solution2 is None:
+            continue
+
+        _, _, angle1 = solution1
+        _, _, angle2 = solution2
+
+        angles1[i] = angle1
+        angles2[i] = angle2
+        valid[i] = (45 <= angle1 <= 315) and (angle2 <= 135 or angle2 >= 225)
+
+    return angles1, angles2, valid
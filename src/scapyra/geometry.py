@@ -1,6 +1,173 @@
-import numpy as np
-from numpy.typing import NDArray
-from typing import Optional
+from __future__ import annotations
+
+import math
+from numbers import Real
+from typing import TYPE_CHECKING, Any, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
+Point = Tuple[float, float]
+
+
+def _circle_intersections(
+    p1x: float,
+    p1y: float,
+    r1: float,
+    p2x: float,
+    p2y: float,
+    r2: float
+) -> Optional[Tuple[Point, Point]]:
+    """
+    Scalar core of find_circle_intersections().
+
+    Works on plain floats and returns a pair of (x, y) tuples, or None if
+    there is no valid intersection.
+    """
+    dx = p2x - p1x
+    dy = p2y - p1y
+    d = math.hypot(dx, dy)
+
+    eps = 1e-9
+    if d > (r1 + r2) or d < abs(r1 - r2) or d < eps:
+        return None
+
+    inv_d = 1.0 / d
+    a = (r1**2 - r2**2 + d**2) * 0.5 * inv_d
+    h_sq = r1**2 - a**2
+
+    # numerical safety for near-tangent case
+    if h_sq < 0:
+        if h_sq > -1e-9:
+            h_sq = 0.0
+        else:
+            return None
+
+    h = math.sqrt(h_sq)
+
+    # unit vector from p1 towards p2
+    ux = dx * inv_d
+    uy = dy * inv_d
+
+    # point along the line between centers
+    px = p1x + a * ux
+    py = p1y + a * uy
+
+    # perpendicular offset
+    ox = -h * uy
+    oy = h * ux
+
+    return (px + ox, py + oy), (px - ox, py - oy)
+
+
+def _as_point(value: Any) -> Optional[Point]:
+    """
+    (x, y) floats from a tuple or list of two real numbers, or None if
+    the value is anything else.
+    """
+    if not isinstance(value, (tuple, list)) or len(value) != 2:
+        return None
+
+    x, y = value
+    if not isinstance(x, Real) or not isinstance(y, Real):
+        return None
+
+    try:
+        return float(x), float(y)
+    except (TypeError, ValueError):
+        return None
+
+
+def _select_by_x(intersections: Tuple[Point, Point], prefer_left: bool = True) -> Point:
+    """
+    Unchecked core of select_intersection_point() for a pair of (x, y) tuples.
+
+    Ties resolve to the first point, like np.argmin/np.argmax.
+    """
+    first, second = intersections
+    if prefer_left:
+        return first if first[0] <= second[0] else second
+    return first if first[0] >= second[0] else second
+
+
+def _angle_from(base_x: float, base_y: float, x: float, y: float) -> float:
+    """
+    Unchecked core of calculate_angle(): angle (in degrees, 0-360)
+    of the point (x, y) seen from (base_x, base_y).
+    """
+    angle = math.degrees(math.atan2(y - base_y, x - base_x))
+
+    # Normalize angle to [0, 360)
+    if angle < 0:
+        angle += 360.0
+
+    return angle
+
+
+def _solve_arm_angle(
+    base_x: float,
+    base_y: float,
+    target_x: float,
+    target_y: float,
+    arm: float,
+    forearm: float,
+    arm_sq: float,
+    rdiff: float,
+    prefer_left: bool = True
+) -> Optional[Tuple[float, float, float]]:
+    """
+    Inverse kinematics of one arm in a single pass: an arm of length `arm`
+    around the base joint and a forearm of length `forearm` around the target.
+
+    Same result as _circle_intersections(), _select_by_x() and _angle_from()
+    combined, but only the selected intersection is built, and the squared
+    link lengths come precomputed (arm_sq = arm**2, rdiff = arm**2 - forearm**2).
+
+    Returns the selected elbow position (x, y) and the arm angle in degrees
+    (0-360), or None if the target is out of reach.
+    """
+    dx = target_x - base_x
+    dy = target_y - base_y
+    # not hypot: math.hypot and np.hypot can differ in the last bit, and the
+    # NumPy path in SCARAController must accept exactly the same targets
+    d = math.sqrt(dx * dx + dy * dy)
+
+    if d > (arm + forearm) or d < abs(arm - forearm) or d < 1e-9:
+        return None
+
+    inv_d = 1.0 / d
+    a = (rdiff + d * d) * 0.5 * inv_d
+    h_sq = arm_sq - a * a
+
+    # numerical safety for near-tangent case
+    if h_sq < 0:
+        if h_sq > -1e-9:
+            h_sq = 0.0
+        else:
+            return None
+
+    h = math.sqrt(h_sq)
+
+    # unit vector from the base towards the target
+    ux = dx * inv_d
+    uy = dy * inv_d
+
+    # perpendicular offset; +offset is the first point, which wins ties
+    ox = -h * uy
+    oy = h * ux
+    if (ox > 0 if prefer_left else ox < 0):
+        ox = -ox
+        oy = -oy
+
+    x = base_x + a * ux + ox
+    y = base_y + a * uy + oy
+
+    angle = math.degrees(math.atan2(y - base_y, x - base_x))
+    if angle < 0:
+        angle += 360.0
+
+    return x, y, angle
 
 
 def find_circle_intersections(
@@ -31,6 +198,8 @@ def find_circle_intersections(
          [xB, yB]]
         or None if there is no valid intersection.
     """
+    import numpy as np
+
     # Ensure numpy arrays of shape (2,)
     p1 = np.asarray(p1, dtype=float).reshape(-1)
     p2 = np.asarray(p2, dtype=float).reshape(-1)
@@ -38,54 +207,50 @@ def find_circle_intersections(
     if p1.shape[0] != 2 or p2.shape[0] != 2:
         return None
 
-    d = np.linalg.norm(p2 - p1)
-
-    eps = 1e-9
-    if d > (r1 + r2) or d < abs(r1 - r2) or d < eps:
+    intersections = _circle_intersections(
+        float(p1[0]), float(p1[1]), r1,
+        float(p2[0]), float(p2[1]), r2
+    )
+    if intersections is None:
         return None
 
-    a = (r1**2 - r2**2 + d**2) / (2 * d)
-    h_sq = r1**2 - a**2
-
-    # numerical safety for near-tangent case
-    if h_sq < 0:
-        if h_sq > -1e-9:
-            h_sq = 0.0
-        else:
-            return None
-
-    h = np.sqrt(h_sq)
-
-    # point along the line between centers
-    p3 = p1 + a * (p2 - p1) / d
-
-    # perpendicular offset
-    offset = h * np.array([-(p2[1] - p1[1]), (p2[0] - p1[0])]) / d
-
-    intersections = np.stack((p3 + offset, p3 - offset))
-    return intersections.astype(float)
+    return np.array(intersections, dtype=float)
 
 
 def select_intersection_point(
-    intersections: Optional[np.ndarray],
+    intersections: Union[np.ndarray, Tuple[Point, Point], None],
     prefer_left: bool = True
-) -> Optional[np.ndarray]:
+) -> Union[np.ndarray, Point, None]:
     """
     Selects one of two intersection points returned by find_circle_intersections().
 
     Parameters
     ----------
-    intersections : np.ndarray | None
-        Array of shape (2, 2) containing two intersection points, or None.
+    intersections : np.ndarray | tuple | None
+        Array of shape (2, 2) containing two intersection points, a pair of
+        (x, y) tuples as returned by _circle_intersections(), or None.
     prefer_left : bool, default=True
         If True, select the point with smaller x-coordinate (leftmost).
         If False, select the point with larger x-coordinate (rightmost).
 
     Returns
     -------
-    np.ndarray | None
-        Selected intersection point as array [x, y], or None if input is invalid.
+    np.ndarray | tuple | None
+        Selected intersection point (same kind as the input), or None if input is invalid.
     """
+    if isinstance(intersections, tuple):
+        if len(intersections) != 2:
+            return None
+
+        first = _as_point(intersections[0])
+        second = _as_point(intersections[1])
+        if first is None or second is None:
+            return None
+
+        return _select_by_x((first, second), prefer_left)
+
+    import numpy as np
+
     if intersections is None or not isinstance(intersections, np.ndarray):
         return None
 
@@ -100,45 +265,43 @@ def select_intersection_point(
     return intersections[idx]
 
 def calculate_angle(
-    point: NDArray[np.floating],
-    intersection: NDArray[np.floating]
+    point: Union[NDArray[np.floating], Point],
+    intersection: Union[NDArray[np.floating], Point]
 ) -> Optional[float]:
     """
     Computes the absolute angle (in degrees) between a reference point and an intersection point.
 
     Parameters
     ----------
-    point : np.ndarray
-        Array [x, y] representing the reference point.
-    intersection : np.ndarray
-        Array [x, y] representing the target point.
+    point : np.ndarray | tuple
+        Array or tuple [x, y] representing the reference point.
+    intersection : np.ndarray | tuple
+        Array or tuple [x, y] representing the target point.
 
     Returns
     -------
     float | None
         Angle in degrees (0-360), or None if input is invalid.
     """
-    if (
-        point is None
-        or intersection is None
-        or not isinstance(point, np.ndarray)
-        or not isinstance(intersection, np.ndarray)
-    ):
-        return None
+    import numpy as np
 
-    if point.shape != (2,) or intersection.shape != (2,):
-        return None
+    coords = []
+    for value in (point, intersection):
+        if isinstance(value, np.ndarray):
+            if value.shape != (2,):
+                return None
+            value = (value[0], value[1])
+        elif not isinstance(value, tuple):
+            return None
 
-    dx = intersection[0] - point[0]
-    dy = intersection[1] - point[1]
+        xy = _as_point(value)
+        if xy is None:
+            return None
+        coords.append(xy)
 
-    angle = np.degrees(np.arctan2(dy, dx))
-    if np.isnan(angle):
+    (base_x, base_y), (x, y) = coords
+    angle = _angle_from(base_x, base_y, x, y)
+    if math.isnan(angle):
         return None
 
-    # Normalize angle to [0, 360)
-    if angle < 0:
-        angle += 360.0
-
-    return float(angle)
-    
\ No newline at end of file
+    return angle
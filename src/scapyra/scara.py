@@ -1,16 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+import functools
 import math
 import time
-from typing import Any, Dict, Optional
-import numpy as np
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
 
 from .driver import PCA9685
-from .geometry import find_circle_intersections, calculate_angle, select_intersection_point
+from .geometry import _solve_arm_angle
+
+# Last pulse written to each channel, per driver rather than per controller,
+# since several controllers can share one driver (see _default_pwm()).
+_LAST_PULSES: weakref.WeakKeyDictionary[Any, Dict[int, int]] = weakref.WeakKeyDictionary()
+
+# Paths shorter than this are solved with NumPy even when numba is installed:
+# importing numba and loading the compiled kernel takes ~0.4 s (over 1 s when
+# it has to compile), far more than NumPy's ~60 us per-call overhead saves
+# on ordinary interpolated moves.
+_JIT_MIN_POINTS: int = 1024
+
+
+@functools.lru_cache(maxsize=None)
+def _default_pwm() -> PCA9685:
+    """ PCA9685 shared by all controllers created without an explicit pwm """
+    pwm = PCA9685(0x40, debug=False)
+    pwm.setPWMFreq(50)
+    return pwm
+
+
+@functools.lru_cache(maxsize=None)
+def _jit_path_solver() -> Optional[Callable[..., Tuple[np.ndarray, np.ndarray, np.ndarray]]]:
+    """ Compiled path solver from _ik_numba, or None when numba isn't installed """
+    try:
+        from ._ik_numba import solve_path
+    except ImportError:
+        return None
+    return solve_path
 
 
 class SCARAController:
     def __init__(
         self,
-        pwm: Any = PCA9685(0x40, debug=False),
+        pwm: Any = None,
         motor1_channel: int = 0,
         motor2_channel: int = 1,
         lift_servo_channel: int = 2,
@@ -25,8 +60,12 @@ class SCARAController:
         motor1_angle_offset: float = 68.0,
         motor2_angle_offset: float = 214.0,
     ) -> None:
+        if pwm is None:
+            # created and configured once, on first use
+            pwm = _default_pwm()
+        else:
+            pwm.setPWMFreq(50)
         self.pwm: Any = pwm
-        self.pwm.setPWMFreq(50)
         self.motor1_channel: int = motor1_channel
         self.motor2_channel: int = motor2_channel
         self.lift_servo_channel: int = lift_servo_channel
@@ -42,11 +81,40 @@ class SCARAController:
         self.motor1_angle_offset: float = motor1_angle_offset
         self.motor2_angle_offset: float = motor2_angle_offset
 
+        # Fixed-point calibration used by angle_to_pulse(), angles in millidegrees
+        self._pulse_num: int = self.max_pulse - self.min_pulse
+        self._pulse_den: int = round(self.max_angle * 1000)
+        self._offsets: Dict[str, float] = {
+            "motor1": motor1_angle_offset,
+            "motor2": motor2_angle_offset,
+        }
+        # Pulses for every integer angle, None where the motor can't reach it
+        self._pulse_tables: Dict[str, List[Optional[int]]] = {
+            motor: [self._compute_pulse(angle, angle_offset) for angle in range(360)]
+            for motor, angle_offset in self._offsets.items()
+        }
+
         self.x1: float = -engine_spacing / 2
         self.y1: float = -50.0
         self.x2: float = engine_spacing / 2
         self.y2: float = -50.0
 
+        # Squared link lengths folded into the IK constants
+        self._r1_sq: float = self.arm**2
+        self._r2_sq: float = self.forearm**2
+        self._rdiff: float = self._r1_sq - self._r2_sq
+
+        # Radii of the annulus each arm can reach around its base
+        self._reach_max: float = self.arm + self.forearm
+        self._reach_min: float = abs(self.arm - self.forearm)
+
+        # Last pulses sent on the driver's channels, None for drivers that can't
+        # be weakly referenced - their pulses are then always sent
+        try:
+            self._last_pulses: Optional[Dict[int, int]] = _LAST_PULSES.setdefault(self.pwm, {})
+        except TypeError:
+            self._last_pulses = None
+
     def angle_to_pulse(self, angle: float, motor: str) -> int:
         """ Angle to pulse for given motor
 
@@ -62,22 +130,173 @@ class SCARAController:
         int
             pulse 
         """
-        if motor == "motor1":
-            angle_offset = self.motor1_angle_offset
-        elif motor == "motor2":
-            angle_offset = self.motor2_angle_offset
-        else:
+        angle_offset = self._offsets.get(motor)
+        if angle_offset is None:
             raise ValueError("Invalid motor identifier. Use 'motor1' or 'motor2'.")
 
-        adjusted_angle = angle - angle_offset
-        adjusted_angle = adjusted_angle % 360
+        if float(angle).is_integer():
+            pulse = self._pulse_tables[motor][int(angle) % 360]
+        else:
+            pulse = self._compute_pulse(angle, angle_offset)
 
-        if not (0 <= adjusted_angle <= self.max_angle):
+        if pulse is None:
             raise ValueError(f"Angle out of range for {motor}. Adjusted angle should be between 0 and {self.max_angle} degrees.")
 
-        pulse = round(((adjusted_angle) / (self.max_angle)) * (self.max_pulse - self.min_pulse) + self.min_pulse)
         return pulse
 
+    def _compute_pulse(self, angle: float, angle_offset: float) -> Optional[int]:
+        """ Pulse for given angle and motor offset, or None if out of range """
+        if not math.isfinite(angle):
+            return None
+
+        adjusted_angle = (angle - angle_offset) % 360
+
+        if not (0 <= adjusted_angle <= self.max_angle):
+            return None
+
+        adjusted_mdeg = round(adjusted_angle * 1000)
+
+        # integer rounding of adjusted / max_angle * (max_pulse - min_pulse)
+        return (adjusted_mdeg * self._pulse_num + self._pulse_den // 2) // self._pulse_den + self.min_pulse
+
+    def _send_pulses(self, angle1: float, angle2: float) -> None:
+        """ Converts both joint angles to pulses and sends them to the motors """
+        pulse1 = self.angle_to_pulse(angle1, "motor1")
+        pulse2 = self.angle_to_pulse(angle2, "motor2")
+        self._write_pulses(pulse1, pulse2)
+
+    def _write_pulses(self, pulse1: int, pulse2: int) -> None:
+        """ Sends the pulses that changed since the last write to the motors' channels """
+        last = self._last_pulses
+        if last is None:
+            self.pwm.setServoPulse(self.motor1_channel, pulse1)
+            self.pwm.setServoPulse(self.motor2_channel, pulse2)
+            return
+
+        if last.get(self.motor1_channel) != pulse1:
+            self.pwm.setServoPulse(self.motor1_channel, pulse1)
+            last[self.motor1_channel] = pulse1
+
+        if last.get(self.motor2_channel) != pulse2:
+            self.pwm.setServoPulse(self.motor2_channel, pulse2)
+            last[self.motor2_channel] = pulse2
+
+    def _solve_arms(
+        self,
+        target_x: float,
+        target_y: float
+    ) -> Optional[Tuple[Tuple[float, float, float], Tuple[float, float, float]]]:
+        """ geometry._solve_arm_angle() for both arms, or None if either can't reach the target """
+        solution1 = _solve_arm_angle(
+            self.x1, self.y1, target_x, target_y,
+            self.arm, self.forearm, self._r1_sq, self._rdiff, prefer_left=True
+        )
+        if solution1 is None:
+            return None
+
+        solution2 = _solve_arm_angle(
+            self.x2, self.y2, target_x, target_y,
+            self.arm, self.forearm, self._r1_sq, self._rdiff, prefer_left=False
+        )
+        if solution2 is None:
+            return None
+
+        return solution1, solution2
+
+    def _solve_path(
+        self,
+        x_values: np.ndarray,
+        y_values: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized inverse kinematics for a sequence of TCP positions.
+
+        Applies the same geometry and workspace constraints as flat_move(),
+        but for all positions at once. Paths of at least _JIT_MIN_POINTS
+        positions run the compiled kernel from _ik_numba when numba is available.
+
+        Parameters
+        ----------
+        x_values : np.ndarray
+            X positions in mm, shape (N,).
+        y_values : np.ndarray
+            Y positions in mm, shape (N,).
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            Angles of motor1 and motor2 in degrees and a boolean mask
+            of positions that flat_move() would accept.
+        """
+        if x_values.shape[0] >= _JIT_MIN_POINTS:
+            solver = _jit_path_solver()
+            if solver is not None:
+                return solver(
+                    x_values, y_values,
+                    self.x1, self.y1, self.x2, self.y2,
+                    self.arm, self.forearm
+                )
+
+        return self._solve_path_numpy(x_values, y_values)
+
+    def _solve_path_numpy(
+        self,
+        x_values: np.ndarray,
+        y_values: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        NumPy implementation of _solve_path(), used for short paths and when
+        numba isn't installed.
+
+        Array form of geometry._solve_arm_angle(); keep the two in step.
+        """
+        import numpy as np
+
+        valid = y_values >= 0
+        angles = []
+
+        for base_x, base_y, prefer_left in (
+            (self.x1, self.y1, True),
+            (self.x2, self.y2, False),
+        ):
+            dx = x_values - base_x
+            dy = y_values - base_y
+            d = np.sqrt(dx * dx + dy * dy)
+
+            valid &= (d <= self._reach_max) & (d >= self._reach_min) & (d >= 1e-9)
+            # keep rejected positions finite, they are masked out anyway
+            d = np.where(valid, d, 1.0)
+
+            inv_d = 1.0 / d
+            a = (self._rdiff + d * d) * 0.5 * inv_d
+            h_sq = self._r1_sq - a * a
+            valid &= h_sq > -1e-9
+            h = np.sqrt(np.maximum(h_sq, 0.0))
+
+            ux = dx * inv_d
+            uy = dy * inv_d
+
+            px = base_x + a * ux
+            py = base_y + a * uy
+            ox = -h * uy
+            oy = h * ux
+
+            # pick the same branch as select_intersection_point (ties -> first point)
+            first = ox <= 0 if prefer_left else ox >= 0
+            ix = np.where(first, px + ox, px - ox)
+            iy = np.where(first, py + oy, py - oy)
+
+            angle = np.degrees(np.arctan2(iy - base_y, ix - base_x))
+            angles.append(np.where(angle < 0, angle + 360.0, angle))
+
+        angle1, angle2 = angles
+
+        # Check workspace constraints
+        valid &= (angle1 >= 45) & (angle1 <= 315)
+        valid &= (angle2 <= 135) | (angle2 >= 225)
+
+        return angle1, angle2, valid
+
     def flat_move(self, target_x: float, target_y: float) -> Optional[Dict[str, Any]]:
         """
         Executes a flat (planar) move of the SCARA robot arm to the specified (x, y) target.
@@ -94,38 +313,35 @@ class SCARAController:
         dict | None
             Dictionary containing geometric data of the movement, or None if the move is impossible.
         """
+        if not (math.isfinite(target_x) and math.isfinite(target_y)):
+            return None
+
         if target_y < 0:
             # Physical constraint
             return None
 
-        r1 = r2 = self.arm
-
-        # Compute intersections for each arm using numpy-based functions
-        intersections1 = find_circle_intersections(
-            np.array([self.x1, self.y1]), r1,
-            np.array([target_x, target_y]), self.forearm
-        )
-        intersections2 = find_circle_intersections(
-            np.array([self.x2, self.y2]), r2,
-            np.array([target_x, target_y]), self.forearm
-        )
-
-        # Validate intersection results
-        if intersections1 is None or intersections2 is None:
+        # Reject targets out of either arm's reach before solving anything,
+        # computing the distance exactly like the IK so no boundary point differs
+        dx1 = target_x - self.x1
+        dy1 = target_y - self.y1
+        d1 = math.sqrt(dx1 * dx1 + dy1 * dy1)
+        if d1 > self._reach_max or d1 < self._reach_min:
             return None
-
-        selected_intersection1 = select_intersection_point(intersections1, prefer_left=True)
-        selected_intersection2 = select_intersection_point(intersections2, prefer_left=False)
-
-        if selected_intersection1 is None or selected_intersection2 is None:
+        dx2 = target_x - self.x2
+        dy2 = target_y - self.y2
+        d2 = math.sqrt(dx2 * dx2 + dy2 * dy2)
+        if d2 > self._reach_max or d2 < self._reach_min:
             return None
 
-        angle1 = calculate_angle(np.array([self.x1, self.y1]), selected_intersection1)
-        angle2 = calculate_angle(np.array([self.x2, self.y2]), selected_intersection2)
+        r1 = r2 = self.arm
 
-        if angle1 is None or angle2 is None:
+        # Solve elbow position and motor angle for each arm
+        solutions = self._solve_arms(target_x, target_y)
+        if solutions is None:
             return None
 
+        (ix1, iy1, angle1), (ix2, iy2, angle2) = solutions
+
         # Check workspace constraints
         if angle1 < 45 or angle1 > 315:
             return None
@@ -137,19 +353,15 @@ class SCARAController:
         self.y = target_y
 
         # Send servo pulses
-        pulse1 = self.angle_to_pulse(angle1, "motor1")
-        self.pwm.setServoPulse(self.motor1_channel, pulse1)
-
-        pulse2 = self.angle_to_pulse(angle2, "motor2")
-        self.pwm.setServoPulse(self.motor2_channel, pulse2)
+        self._send_pulses(angle1, angle2)
 
         # Return geometry for visualization / debug
         return {
             "x1": self.x1, "y1": self.y1, "r1": r1,
             "x2": self.x2, "y2": self.y2, "r2": r2,
             "x3": target_x, "y3": target_y, "r3": self.forearm,
-            "intersection1": selected_intersection1,
-            "intersection2": selected_intersection2,
+            "intersection1": (ix1, iy1),
+            "intersection2": (ix2, iy2),
             "angle1": angle1,
             "angle2": angle2,
         }
@@ -183,17 +395,97 @@ class SCARAController:
             True if the full interpolated path was executed,
             False if any intermediate move was not possible.
         """
-        x_values = np.linspace(self.x, target_x, steps)
-        y_values = np.linspace(self.y, target_y, steps)
+        import numpy as np
+
+        # Both coordinates from a single linspace call, unpacked as row views
+        x_values, y_values = np.linspace((self.x, self.y), (target_x, target_y), steps, axis=1)
 
-        for x_val, y_val in zip(x_values, y_values):
-            move_data = self.flat_move(float(x_val), float(y_val))
-            if move_data is None:
+        # Solve the whole path up front, only the servo I/O stays in the loop
+        angles1, angles2, valid = self._solve_path(x_values, y_values)
+
+        for x_val, y_val, angle1, angle2, ok in zip(
+            x_values.tolist(), y_values.tolist(),
+            angles1.tolist(), angles2.tolist(), valid.tolist()
+        ):
+            if not ok:
                 return False
+
+            self.x = x_val
+            self.y = y_val
+            self._send_pulses(angle1, angle2)
             time.sleep(delay)
 
         return True
 
+    def flat_move_batch(
+        self,
+        x_values: np.ndarray,
+        y_values: np.ndarray,
+        delay: float = 0.0
+    ) -> np.ndarray:
+        """
+        Executes a sequence of flat moves given as separate X and Y arrays,
+        e.g. a precomputed trajectory.
+
+        Inverse kinematics and pulse conversion run for the whole sequence
+        up front; the positions are then executed in order, with a delay
+        between them, until the first one that is not possible.
+
+        Parameters
+        ----------
+        x_values : array-like of shape (N,)
+            X positions in mm.
+        y_values : array-like of shape (N,)
+            Y positions in mm.
+        delay : float, default=0.0
+            Delay in seconds between consecutive positions.
+
+        Returns
+        -------
+        np.ndarray
+            Integer array of shape (N, 2) with the pulses of motor1 and motor2
+            for every position, -1 where the position is not possible.
+        """
+        import numpy as np
+
+        x_values = np.asarray(x_values, dtype=float).reshape(-1)
+        y_values = np.asarray(y_values, dtype=float).reshape(-1)
+        if x_values.shape != y_values.shape:
+            raise ValueError("x_values and y_values must have the same length.")
+
+        angles1, angles2, valid = self._solve_path(x_values, y_values)
+
+        pulses = np.stack((
+            self._pulses_from_angles(angles1, "motor1"),
+            self._pulses_from_angles(angles2, "motor2"),
+        ), axis=1)
+        pulses[~valid] = -1
+
+        for x_val, y_val, (pulse1, pulse2) in zip(
+            x_values.tolist(), y_values.tolist(), pulses.tolist()
+        ):
+            if pulse1 < 0 or pulse2 < 0:
+                break
+
+            self.x = x_val
+            self.y = y_val
+            self._write_pulses(pulse1, pulse2)
+            time.sleep(delay)
+
+        return pulses
+
+    def _pulses_from_angles(self, angles: np.ndarray, motor: str) -> np.ndarray:
+        """ Vectorized angle_to_pulse(), -1 where the angle is out of range """
+        import numpy as np
+
+        finite = np.isfinite(angles)
+        adjusted = (np.where(finite, angles, 0.0) - self._offsets[motor]) % 360
+        in_range = finite & (adjusted >= 0) & (adjusted <= self.max_angle)
+
+        adjusted_mdeg = np.rint(np.where(in_range, adjusted, 0.0) * 1000).astype(np.int64)
+        pulses = (adjusted_mdeg * self._pulse_num + self._pulse_den // 2) // self._pulse_den + self.min_pulse
+        return np.where(in_range, pulses, -1)
+
     def lift_robot(
         self,
         height_cm: float = 10.0,
@@ -220,14 +512,23 @@ class SCARAController:
         bool
             True if the lift action was executed successfully.
         """
-        try:
-            self.pwm.setServoPulse(self.lift_servo_channel, lift_pulse)
-            time.sleep(lift_time)
-            self.pwm.setServoPulse(self.lift_servo_channel, stop_pulse)
-            return True
-        except Exception:
-            return False
+        return self._drive_vertical_servo(lift_pulse, lift_time, stop_pulse)
 
+    async def lift_robot_async(
+        self,
+        height_cm: float = 10.0,
+        lift_time: float = 10.0,
+        lift_pulse: int = 1500,
+        stop_pulse: int = 1550
+    ) -> bool:
+        """
+        Non-blocking variant of lift_robot().
+
+        Awaits the lift duration instead of sleeping, so the caller's event
+        loop can run other work while the servo moves. Parameters and return
+        value are the same as in lift_robot().
+        """
+        return await self._drive_vertical_servo_async(lift_pulse, lift_time, stop_pulse)
 
     def lower_robot(
         self,
@@ -255,9 +556,39 @@ class SCARAController:
         bool
             True if the lowering action was executed successfully.
         """
+        return self._drive_vertical_servo(lower_pulse, lower_time, stop_pulse)
+
+    async def lower_robot_async(
+        self,
+        height_cm: float = 10.0,
+        lower_time: float = 10.0,
+        lower_pulse: int = 1610,
+        stop_pulse: int = 1550
+    ) -> bool:
+        """
+        Non-blocking variant of lower_robot().
+
+        Awaits the lowering duration instead of sleeping, so the caller's event
+        loop can run other work while the servo moves. Parameters and return
+        value are the same as in lower_robot().
+        """
+        return await self._drive_vertical_servo_async(lower_pulse, lower_time, stop_pulse)
+
+    def _drive_vertical_servo(self, pulse: int, duration: float, stop_pulse: int) -> bool:
+        """ Runs the vertical servo with `pulse` for `duration` seconds, then stops it """
+        try:
+            self.pwm.setServoPulse(self.lift_servo_channel, pulse)
+            time.sleep(duration)
+            self.pwm.setServoPulse(self.lift_servo_channel, stop_pulse)
+            return True
+        except Exception:
+            return False
+
+    async def _drive_vertical_servo_async(self, pulse: int, duration: float, stop_pulse: int) -> bool:
+        """ Awaiting variant of _drive_vertical_servo() """
         try:
-            self.pwm.setServoPulse(self.lift_servo_channel, lower_pulse)
-            time.sleep(lower_time)
+            self.pwm.setServoPulse(self.lift_servo_channel, pulse)
+            await asyncio.sleep(duration)
             self.pwm.setServoPulse(self.lift_servo_channel, stop_pulse)
             return True
         except Exception:
@@ -2,7 +2,7 @@ import numpy as np
 import pytest
 from numpy.typing import NDArray
 
-from ScaPyra.geometry import find_circle_intersections, select_intersection_point, calculate_angle
+from ScaPyra.geometry import _circle_intersections, _solve_arm_angle, find_circle_intersections, select_intersection_point, calculate_angle
 
 
 def assert_points_equal_unordered(a: NDArray[np.floating], b: NDArray[np.floating], tol: float = 1e-6) -> None:
@@ -150,6 +150,60 @@ def test_invalid_input_shape_returns_none() -> None:
         # jeśli nie masz, możesz asertywnie sprawdzić tylko brak wyjątku
         assert result is None or isinstance(result, np.ndarray)
 
+
+def test_malformed_tuples_return_none() -> None:
+    """
+    Krotki o złej budowie (brak drugiego punktu, None, zagnieżdżone
+    współrzędne) -> None zamiast TypeError/ValueError.
+    """
+    assert select_intersection_point((1.0, 2.0)) is None
+    assert select_intersection_point(((1.0, 2.0), None)) is None
+    assert select_intersection_point(((1.0, 2.0), (3.0,))) is None
+    assert select_intersection_point(((1.0, 2.0), ("3", 4.0))) is None
+
+    assert calculate_angle((0.0, 0.0), ((1, 2), 3)) is None
+    assert calculate_angle((0.0, 0.0), (None, None)) is None
+    assert calculate_angle((0.0,), (1.0, 0.0)) is None
+    assert calculate_angle((0.0, 0.0), ("1", 0.0)) is None
+    assert calculate_angle((0.0, 0.0), np.array([None, 1.0])) is None
+def test_scalar_core_matches_array_version() -> None:
+    """
+    Wersja skalarna (_circle_intersections) powinna zwracać te same punkty
+    co find_circle_intersections, tylko jako krotki.
+    """
+    result = _circle_intersections(0.0, 0.0, 5.0, 6.0, 0.0, 5.0)
+
+    assert isinstance(result, tuple)
+    assert len(result) == 2
+    expected = find_circle_intersections(np.array([0.0, 0.0]), 5.0, np.array([6.0, 0.0]), 5.0)
+    assert np.allclose(np.array(result), expected)
+
+
+def test_scalar_core_no_intersection_returns_none() -> None:
+    """Brak przecięć -> None, tak jak w wersji tablicowej."""
+    assert _circle_intersections(0.0, 0.0, 2.0, 10.0, 0.0, 2.0) is None
+    assert _circle_intersections(2.0, -3.0, 4.0, 2.0, -3.0, 4.0) is None
+
+def test_solve_arm_angle_matches_public_helpers() -> None:
+    """
+    Połączony kernel (_solve_arm_angle) musi dać ten sam punkt i kąt co
+    find_circle_intersections + select_intersection_point + calculate_angle.
+    """
+    base = np.array([-80.0, -50.0])
+    for target_x, target_y in [(0.0, 100.0), (150.0, 250.0), (-200.0, 80.0)]:
+        target = np.array([target_x, target_y])
+        for prefer_left in (True, False):
+            result = _solve_arm_angle(-80.0, -50.0, target_x, target_y, 180.0, 260.0, 180.0**2, 180.0**2 - 260.0**2, prefer_left)
+
+            point = select_intersection_point(
+                find_circle_intersections(base, 180.0, target, 260.0), prefer_left=prefer_left
+            )
+            assert result is not None
+            assert np.allclose(result[:2], point)
+            assert abs(result[2] - calculate_angle(base, point)) < 1e-9
+
+    assert _solve_arm_angle(-80.0, -50.0, 500.0, 500.0, 180.0, 260.0, 180.0**2, 180.0**2 - 260.0**2) is None
+
 def test_select_returns_point_with_lowest_x() -> None:
     """
     Sprawdza, czy funkcja poprawnie wybiera punkt o mniejszej współrzędnej X.
@@ -215,6 +269,16 @@ def test_output_is_numpy_array() -> None:
     assert isinstance(result, np.ndarray)
     assert result.shape == (2,)
 
+def test_select_accepts_tuples() -> None:
+    """
+    Para krotek (wynik _circle_intersections) też jest obsługiwana,
+    a wynik jest krotką.
+    """
+    intersections = ((5.0, 2.0), (3.0, -1.0))
+
+    assert select_intersection_point(intersections) == (3.0, -1.0)
+    assert select_intersection_point(intersections, prefer_left=False) == (5.0, 2.0)
+
 def test_angle_right() -> None:
     """Punkt docelowy po prawej stronie powinien dać 0 stopni."""
     p = np.array([0.0, 0.0])
@@ -259,6 +323,12 @@ def test_angle_quadrant_general() -> None:
     assert 0.0 < angle < 90.0
 
 
+def test_angle_accepts_tuples() -> None:
+    """Krotki [x, y] dają ten sam wynik co tablice."""
+    assert abs(calculate_angle((0.0, 0.0), (0.0, 1.0)) - 90.0) < 1e-9
+    assert abs(calculate_angle((1.0, 1.0), (0.0, 1.0)) - 180.0) < 1e-9
+
+
 def test_invalid_input_returns_none() -> None:
     """Zwraca None dla błędnych danych."""
     assert calculate_angle(None, np.array([1.0, 0.0])) is None
@@ -0,0 +1,283 @@
+import asyncio
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from ScaPyra.scara import SCARAController
+
+
+class FakePWM:
+    """Zastępuje PCA9685 - zapisuje wysłane impulsy zamiast gadać z I2C."""
+
+    def __init__(self) -> None:
+        self.pulses: List[Tuple[int, int]] = []
+
+    def setPWMFreq(self, freq: float) -> None:
+        pass
+
+    def setServoPulse(self, channel: int, pulse: int) -> None:
+        self.pulses.append((channel, pulse))
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("ScaPyra.scara.time.sleep", lambda _: None)
+
+
+@pytest.fixture(params=["numpy", "numba"])
+def path_solver(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Wymusza implementację _solve_path: NumPy albo skompilowany kernel numba."""
+    if request.param == "numpy":
+        monkeypatch.setattr("ScaPyra.scara._jit_path_solver", lambda: None)
+    else:
+        pytest.importorskip("numba")
+        monkeypatch.setattr("ScaPyra.scara._JIT_MIN_POINTS", 0)
+    return request.param
+
+
+def test_interpolated_move_matches_sequential_flat_moves(path_solver: str) -> None:
+    """
+    Wektorowa interpolacja powinna wysłać dokładnie te same impulsy,
+    co kolejne wywołania flat_move() dla punktów na odcinku.
+    """
+    pwm_batch = FakePWM()
+    scara = SCARAController(pwm=pwm_batch)
+    assert scara.interpolated_flat_move(100.0, 250.0, steps=25)
+    assert (scara.x, scara.y) == (100.0, 250.0)
+
+    pwm_seq = FakePWM()
+    reference = SCARAController(pwm=pwm_seq)
+    for i in range(25):
+        x = 0.0 + (100.0 - 0.0) * i / 24
+        y = 100.0 + (250.0 - 100.0) * i / 24
+        assert reference.flat_move(x, y) is not None
+
+    assert pwm_batch.pulses == pwm_seq.pulses
+
+
+def test_interpolated_move_stops_at_unreachable_point() -> None:
+    """
+    Punkt poza zasięgiem ramion -> False, a ruch zatrzymuje się
+    na ostatnim osiągalnym punkcie.
+    """
+    pwm = FakePWM()
+    scara = SCARAController(pwm=pwm)
+
+    assert not scara.interpolated_flat_move(0.0, 600.0, steps=10)
+    assert 100.0 <= scara.y < 600.0
+    assert len(pwm.pulses) % 2 == 0
+
+
+def test_angle_to_pulse_table_matches_formula() -> None:
+    """Tablica dla całkowitych kątów musi dawać te same impulsy co wzór."""
+    scara = SCARAController(pwm=FakePWM())
+
+    for motor, offset in (("motor1", 68.0), ("motor2", 214.0)):
+        for angle in range(360):
+            expected = scara._compute_pulse(float(angle), offset)
+            if expected is None:
+                with pytest.raises(ValueError):
+                    scara.angle_to_pulse(angle, motor)
+            else:
+                assert scara.angle_to_pulse(angle, motor) == expected
+
+
+def test_angle_to_pulse_range_edges() -> None:
+    """
+    Kąt tuż poza zakresem silnika (nawet o ułamek milistopnia)
+    oraz kąty nieskończone/NaN -> ValueError.
+    """
+    scara = SCARAController(pwm=FakePWM())
+
+    assert scara.angle_to_pulse(68.0, "motor1") == 2590
+    assert scara.angle_to_pulse(338.0, "motor1") == 570
+    for angle in (67.9996, 338.0009, float("inf"), float("-inf"), float("nan")):
+        with pytest.raises(ValueError):
+            scara.angle_to_pulse(angle, "motor1")
+
+
+def test_pulses_from_angles_matches_angle_to_pulse() -> None:
+    """Wektorowa konwersja daje te same impulsy co angle_to_pulse, -1 poza zakresem."""
+    scara = SCARAController(pwm=FakePWM())
+    angles = np.concatenate((np.linspace(0.0, 360.0, 7201), [67.9996, 338.0009, np.inf, np.nan]))
+
+    pulses = scara._pulses_from_angles(angles, "motor1")
+
+    for angle, pulse in zip(angles.tolist(), pulses.tolist()):
+        try:
+            expected = scara.angle_to_pulse(angle, "motor1")
+        except ValueError:
+            expected = -1
+        assert pulse == expected
+
+
+def test_angle_to_pulse_invalid_motor() -> None:
+    """Nieznany silnik -> ValueError."""
+    scara = SCARAController(pwm=FakePWM())
+    with pytest.raises(ValueError):
+        scara.angle_to_pulse(90, "motor3")
+
+
+def test_unchanged_pulse_is_not_resent() -> None:
+    """Powtórzony ruch do tego samego punktu nie wysyła nic przez I2C."""
+    pwm = FakePWM()
+    scara = SCARAController(pwm=pwm)
+
+    assert scara.flat_move(20.0, 200.0) is not None
+    sent = len(pwm.pulses)
+    assert sent == 2
+
+    assert scara.flat_move(20.0, 200.0) is not None
+    assert len(pwm.pulses) == sent
+
+
+def test_controllers_sharing_a_driver_resend_pulses() -> None:
+    """
+    Dwa kontrolery na jednym sterowniku: po ruchu drugiego powrót pierwszego
+    do poprzedniego punktu musi znowu wysłać impulsy.
+    """
+    pwm = FakePWM()
+    first = SCARAController(pwm=pwm)
+    second = SCARAController(pwm=pwm)
+
+    assert first.flat_move(20.0, 200.0) is not None
+    expected = pwm.pulses[-2:]
+    assert second.flat_move(-20.0, 180.0) is not None
+
+    sent = len(pwm.pulses)
+    assert first.flat_move(20.0, 200.0) is not None
+    assert pwm.pulses[sent:] == expected
+
+
+def test_flat_move_non_finite_target_returns_none() -> None:
+    """NaN lub nieskończoność w celu -> None, bez wyjątku i bez ruchu."""
+    pwm = FakePWM()
+    scara = SCARAController(pwm=pwm)
+
+    assert scara.flat_move(float("nan"), 100.0) is None
+    assert scara.flat_move(0.0, float("nan")) is None
+    assert scara.flat_move(float("inf"), 100.0) is None
+    assert pwm.pulses == []
+    assert (scara.x, scara.y) == (0.0, 100.0)
+
+
+def test_lift_and_lower() -> None:
+    """Podnoszenie i opuszczanie: impuls ruchu, potem impuls stopu."""
+    pwm = FakePWM()
+    scara = SCARAController(pwm=pwm)
+
+    assert scara.lift_robot(lift_time=0.0)
+    assert scara.lower_robot(lower_time=0.0)
+    assert pwm.pulses == [(2, 1500), (2, 1550), (2, 1610), (2, 1550)]
+
+
+def test_lift_and_lower_async() -> None:
+    """Wersje async wysyłają te same impulsy co wersje blokujące."""
+    pwm = FakePWM()
+    scara = SCARAController(pwm=pwm)
+
+    assert asyncio.run(scara.lift_robot_async(lift_time=0.0))
+    assert asyncio.run(scara.lower_robot_async(lower_time=0.0))
+    assert pwm.pulses == [(2, 1500), (2, 1550), (2, 1610), (2, 1550)]
+
+
+def test_numba_path_solver_matches_numpy() -> None:
+    """Skompilowany kernel (numba) musi zgadzać się z wersją NumPy."""
+    pytest.importorskip("numba")
+    from ScaPyra._ik_numba import solve_path
+
+    scara = SCARAController(pwm=FakePWM())
+    xs, ys = np.meshgrid(np.linspace(-450.0, 450.0, 61), np.linspace(-30.0, 480.0, 53))
+    xs = xs.ravel()
+    ys = ys.ravel()
+
+    angles1, angles2, valid = solve_path(
+        xs, ys, scara.x1, scara.y1, scara.x2, scara.y2, scara.arm, scara.forearm
+    )
+    ref1, ref2, ref_valid = scara._solve_path_numpy(xs, ys)
+
+    assert valid.any() and not valid.all()
+    assert np.array_equal(valid, ref_valid)
+    assert np.allclose(angles1[valid], ref1[valid], atol=1e-9)
+    assert np.allclose(angles2[valid], ref2[valid], atol=1e-9)
+
+
+def test_numba_kernel_digest_is_current() -> None:
+    """
+    Skrót źródła geometry._solve_arm_angle w _ik_numba musi być aktualny,
+    inaczej kernel nie korzysta z cache (a po zmianie skrótu cache się unieważnia).
+    """
+    pytest.importorskip("numba")
+    from ScaPyra import _ik_numba
+
+    assert _ik_numba._GEOMETRY_DIGEST == _ik_numba._geometry_digest()
+
+
+def test_flat_move_batch_pulses() -> None:
+    """
+    flat_move_batch zwraca impulsy jak angle_to_pulse, -1 dla punktów
+    niemożliwych, i zatrzymuje ruch na pierwszym takim punkcie.
+    """
+    pwm = FakePWM()
+    scara = SCARAController(pwm=pwm)
+    xs = np.array([0.0, 20.0, 40.0, 0.0, 60.0])
+    ys = np.array([150.0, 200.0, 250.0, -10.0, 200.0])
+
+    pulses = scara.flat_move_batch(xs, ys)
+
+    assert pulses.shape == (5, 2)
+    assert list(pulses[3]) == [-1, -1]
+    assert (pulses[[0, 1, 2, 4]] > 0).all()
+    assert (scara.x, scara.y) == (40.0, 250.0)
+
+    reference = SCARAController(pwm=FakePWM())
+    for i in (0, 1, 2, 4):
+        move = reference.flat_move(xs[i], ys[i])
+        assert move is not None
+        assert pulses[i, 0] == reference.angle_to_pulse(move["angle1"], "motor1")
+        assert pulses[i, 1] == reference.angle_to_pulse(move["angle2"], "motor2")
+
+    assert pwm.pulses[-2:] == [(0, pulses[2, 0]), (1, pulses[2, 1])]
+
+
+def test_flat_move_and_batch_agree_at_reach_boundary(path_solver: str) -> None:
+    """
+    Na granicy zasięgu ramion (pełne wyprostowanie i złożenie, ± 1 ulp)
+    flat_move i flat_move_batch akceptują i odrzucają te same punkty.
+    """
+    scara = SCARAController(pwm=FakePWM())
+    xs = [39.2898054]
+    ys = [373.5208877]
+    for base_x in (scara.x1, scara.x2):
+        for radius in (scara.arm + scara.forearm, abs(scara.arm - scara.forearm)):
+            for t in np.linspace(0.05, np.pi - 0.05, 120):
+                x = base_x + radius * np.cos(t)
+                y = scara.y1 + radius * np.sin(t)
+                for dx in (-np.inf, 0.0, np.inf):
+                    xs.append(float(np.nextafter(x, dx)) if dx else x)
+                    ys.append(y)
+
+    pulses = scara.flat_move_batch(np.array(xs), np.array(ys))
+
+    reference = SCARAController(pwm=FakePWM())
+    accepted = rejected = 0
+    for x, y, row in zip(xs, ys, pulses.tolist()):
+        try:
+            move = reference.flat_move(x, y)
+        except ValueError:
+            # reachable, but out of the servo range - batch marks that motor with -1
+            assert -1 in row and row != [-1, -1]
+            continue
+
+        if move is None:
+            rejected += 1
+            assert row == [-1, -1]
+        else:
+            accepted += 1
+            assert row == [
+                reference.angle_to_pulse(move["angle1"], "motor1"),
+                reference.angle_to_pulse(move["angle2"], "motor2"),
+            ]
+
+    assert accepted and rejected